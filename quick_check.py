@@ -2,29 +2,57 @@
 
 import sys
 
+import numpy as np
 import pandas as pd
 
 infile = sys.argv[1]
 
-with open(infile) as f:
-    times = f.readlines()
+df = pd.read_csv(infile)
 
-n = len(times) - 1
-
-flat_list = [item for sublist in [x.strip().split(",") for x in times[1:]] for item in sublist]
-
-pd_times = pd.to_datetime(flat_list)
+# parse in two batches, 12h and 24h, with an explicit format: no per element format guessing
+raw = pd.Series(df.values.ravel()).str.replace(" ", "").str.lower()
+is_12 = raw.str.contains(r"[ap]m$", na=False)
+is_24 = raw.notna() & ~is_12
+pd_times = pd.Series(pd.NaT, index=raw.index, dtype="datetime64[ns]")
+pd_times[is_12] = pd.to_datetime(raw[is_12], format="%I:%M%p", cache=True)
+pd_times[is_24] = pd.to_datetime(raw[is_24], format="%H:%M", cache=True)
 pd_starts = pd_times[::2]
 pd_ends = pd_times[1::2]
 
+# rows with a missing start or end (working hours lines) are not meetings
+keep = np.flatnonzero(pd_starts.notna().values & pd_ends.notna().values)
+
+# pairwise overlaps via broadcasting on int64 nanoseconds, tiled on both axes so
+# each temporary is at most block x block
+s = pd_starts.values.astype("datetime64[ns]").view("i8")[keep]
+e = pd_ends.values.astype("datetime64[ns]").view("i8")[keep]
+m = len(keep)
+block = 1024
+
+i_all, j_all, ls_all, ee_all = [], [], [], []
+for r0 in range(0, m, block):
+    for c0 in range(r0, m, block):
+        ls = np.maximum.outer(s[r0 : r0 + block], s[c0 : c0 + block])
+        ee = np.minimum.outer(e[r0 : r0 + block], e[c0 : c0 + block])
+        mask = ee > ls
+        if c0 == r0:
+            mask = np.triu(mask, k=1)  # only j > i
+        i_idx, j_idx = np.nonzero(mask)
+        i_all.append(i_idx + r0)
+        j_all.append(j_idx + c0)
+        ls_all.append(ls[i_idx, j_idx])
+        ee_all.append(ee[i_idx, j_idx])
+
 clashes = []
-for i in range(n - 1):
-    for j in range(i + 1, n):
-        lastest_start = max(pd_starts[i], pd_starts[j])
-        earliest_end = min(pd_ends[i], pd_ends[j])
-        if earliest_end > lastest_start:  # we have a clash
-            delta = earliest_end - lastest_start
-            clashes.append((i, j, delta.seconds // 60, lastest_start.strftime("%H:%M"), earliest_end.strftime("%H:%M")))
+if i_all:
+    i_idx, j_idx = np.concatenate(i_all), np.concatenate(j_all)
+    l_start, e_end = np.concatenate(ls_all), np.concatenate(ee_all)
+    order = np.lexsort((j_idx, i_idx))  # report ordered by first meeting, then second one
+    i_idx, j_idx, l_start, e_end = i_idx[order], j_idx[order], l_start[order], e_end[order]
+    mins = (e_end - l_start) // (60 * 10**9)
+    begins = pd.to_datetime(l_start).strftime("%H:%M")
+    ends = pd.to_datetime(e_end).strftime("%H:%M")
+    clashes = list(zip(keep[i_idx].tolist(), keep[j_idx].tolist(), mins.tolist(), begins, ends))
 
 for row in clashes:
     m1, m2, mtime, begin, end = row
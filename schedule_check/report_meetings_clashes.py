@@ -3,22 +3,32 @@
 Report which meetings are clashing with one another.
 """
 import argparse
+import csv
 import re
+import sys
+from array import array
 from datetime import datetime, timedelta
-from functools import cmp_to_key
-from typing import List, Optional, Tuple
+from functools import lru_cache, total_ordering
+from typing import Iterator, List, Optional, Sequence, Tuple
 
 fmt_day = "%Y-%m-%d"
-fmt_12 = f"{fmt_day}.%I:%M%p"
-fmt_24 = f"{fmt_day}.%H:%M"
 
 today = datetime.today()
 str_today = today.strftime(fmt_day)
 
-H12 = re.compile(r"\d+-\d+-\d+\.\d+:\d+\s?(am|pm)", re.IGNORECASE)
-H24 = re.compile(r"\b\d+-\d+-\d+\.\d+:\d+\b", re.IGNORECASE)
+epoch_ordinal = datetime(1970, 1, 1).toordinal()
 
+# report lines held in memory before they are written out
+report_batch_lines = 65536
 
+# YYYY-MM-DD.HH:MM[am|pm], groups are parsed by hand in get_time_obj
+TIME_RE = re.compile(
+    r"(?P<year>\d{4})-(?P<month>\d{1,2})-(?P<day>\d{1,2})\.(?P<hour>\d{1,2}):(?P<minute>\d{1,2})(?:\s?(?P<ampm>am|pm))?",
+    re.IGNORECASE,
+)
+
+
+@total_ordering
 class Meeting:
     """
     Class to define a meeting.
@@ -28,10 +38,28 @@ class Meeting:
         start (datetime)       : Meeting starting time
         end (datetime)         : Meeting ending time
         str_day (str, optional): Day of the meeting. Defaults to current day.
-        day_start              : Working hours start
-        day_end                : Working hours end
+        str_start (str)        : Meeting starting time as HH:MM
+        str_end (str)          : Meeting ending time as HH:MM
+        ts_start (int)         : Meeting starting time in minutes since epoch
+        ts_end (int)           : Meeting ending time in minutes since epoch
+        day_start (datetime)   : Working hours start
+        day_end (datetime)     : Working hours end
     """
 
+    __slots__ = (
+        "name",
+        "start",
+        "end",
+        "str_day",
+        "str_start",
+        "str_end",
+        "ts_start",
+        "ts_end",
+        "day_start",
+        "day_end",
+        "is_valid",
+    )
+
     def __init__(self, name: str, start: str, end: str, day: Optional[str] = None):
         """
         Args:
@@ -48,67 +76,92 @@ class Meeting:
         end = f"{day}.{end}"
         self.start = get_time_obj(start)
         self.end = get_time_obj(end)
+        # formatted once, used by every repr
+        self.str_start = f"{self.start.hour:02d}:{self.start.minute:02d}"
+        self.str_end = f"{self.end.hour:02d}:{self.end.minute:02d}"
+        self.ts_start = _minutes(self.start)
+        self.ts_end = _minutes(self.end)
         self.is_valid = True  # until proved not
 
-    def check_validity(self, day_start: str, day_end: str) -> bool:
+    def check_validity(self, day_start: datetime, day_end: datetime) -> bool:
         """
         Check if a Meeting is within working hours
 
         Args:
-            day_start (str): Day starting time in string
-            day_end (str): Day ending time in string
+            day_start (datetime): Day starting time
+            day_end (datetime): Day ending time
 
         Returns:
             bool: True or false
         """
-        self.day_start = get_time_obj(f"{self.str_day}.{day_start}")
-        self.day_end = get_time_obj(f"{self.str_day}.{day_end}")
+        self.day_start = day_start
+        self.day_end = day_end
         if self.start < self.day_start:
             self.is_valid = False
         if self.end > self.day_end:
             self.is_valid = False
         return self.is_valid
 
-    @staticmethod
-    def comparator(a, b) -> int:
-        """Used to sort a list of Meetings."""
-        res = 0
-        if a.start < b.start:
-            res = -1
-        elif a.start > b.start:
-            res = 1
-        elif a.start == b.start:
-            if a.end > b.end:
-                res = 1
-            elif a.end < b.end:
-                res = -1
-            elif a.end == b.end:
-                res = _sort_names([a.name, b.name])
-        return res
+    def _key(self) -> Tuple[datetime, datetime, str]:
+        """Meetings are ordered by start, then end, then name."""
+        return (self.start, self.end, self.name)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Meeting):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __lt__(self, other) -> bool:
+        if not isinstance(other, Meeting):
+            return NotImplemented
+        return self._key() < other._key()
+
+    def __hash__(self) -> int:
+        return hash(self._key())
 
     def __repr__(self) -> str:
-        return f"{self.name} @ {self.start.strftime('%H:%M')}_{self.end.strftime('%H:%M')}"
+        return f"{self.name} @ {self.str_start}_{self.str_end}"
 
 
-def _sort_names(alist: List[str]) -> int:
+class MeetingSet:
     """
-    Helps Meeting.comparator to sort by name
-    fully clashing meetings.
+    Meetings stored as packed arrays (struct of arrays) for bulk clash detection.
+
+    Attributes:
+        meetings (List[Meeting]): Meetings, in the same order as the arrays
+        starts (array)          : Meetings starting times, in minutes since epoch
+        ends (array)            : Meetings ending times, in minutes since epoch
     """
-    if alist[0] == alist[1]:
-        return 0
-    n_list = alist[:]
-    n_list.sort()
-    if n_list == alist:
-        return -1
-    else:
-        return 1
+
+    __slots__ = ("meetings", "starts", "ends")
+
+    def __init__(self, meetings: List[Meeting]):
+        """
+        Args:
+            meetings (List[Meeting]): list of Meetings objects
+        """
+        self.meetings = meetings
+        self.starts = array("q", [m.ts_start for m in meetings])
+        self.ends = array("q", [m.ts_end for m in meetings])
+
+
+def _minutes(dt: datetime) -> int:
+    """Minutes since epoch of a datetime, in plain int arithmetic (no timedelta)."""
+    return (dt.toordinal() - epoch_ordinal) * 1440 + dt.hour * 60 + dt.minute
 
 
+def _hh_mm(minutes: int) -> str:
+    """Format minutes since epoch as HH:MM."""
+    return f"{minutes // 60 % 24:02d}:{minutes % 60:02d}"
+
+
+@lru_cache(maxsize=4096)
 def get_time_obj(atime: str) -> datetime:
     """
     Normalise and return a datetime object.
 
+    Results are cached, the same time strings repeat a lot across meetings.
+
     Args:
         atime (str): 'YYYY-MM-DD HH:MM[am| PM]'
 
@@ -118,19 +171,38 @@ def get_time_obj(atime: str) -> datetime:
     Returns:
         datetime: datetime obj
     """
-    d = H12.match(atime)
-    if d:
-        # remove space before AM|pm
-        res = d.group().replace(" ", "")
-        return datetime.strptime(res, fmt_12)
-
-    d = H24.fullmatch(atime)
-    if d:
-        if "24:00" in d.group():  # next day
-            return datetime.strptime(d.group().replace("24:00", "00:00"), fmt_24) + timedelta(days=1)
-        return datetime.strptime(d.group(), fmt_24)
-
-    raise ValueError("Invalid time string format: it must be HH:MM or HH:MM AM or HH:MMpm (case insensitive)")
+    # fast path for the canonical YYYY-MM-DD.HH:MM form, no regex needed
+    if (
+        len(atime) == 16
+        and atime[4] == "-"
+        and atime[7] == "-"
+        and atime[10] == "."
+        and atime[13] == ":"
+        and (atime[:4] + atime[5:7] + atime[8:10] + atime[11:13] + atime[14:]).isdecimal()
+    ):
+        year, month, day, hour, minute = (
+            int(atime[:4]),
+            int(atime[5:7]),
+            int(atime[8:10]),
+            int(atime[11:13]),
+            int(atime[14:]),
+        )
+    else:
+        d = TIME_RE.fullmatch(atime)
+        if d:
+            year, month, day, hour, minute = map(int, d.group("year", "month", "day", "hour", "minute"))
+            ampm = d.group("ampm")
+        if not d or ampm and not 1 <= hour <= 12:
+            raise ValueError("Invalid time string format: it must be HH:MM or HH:MM AM or HH:MMpm (case insensitive)")
+        if ampm:
+            # 12am = 00:00, 12pm = 12:00
+            hour %= 12
+            if ampm.lower() == "pm":
+                hour += 12
+
+    if hour == 24 and atime.endswith("24:00"):  # next day, only in that exact form
+        return datetime(year, month, day) + timedelta(days=1)
+    return datetime(year, month, day, hour, minute)
 
 
 def parse_cmdline() -> argparse.Namespace:
@@ -155,38 +227,56 @@ def parse_cmdline() -> argparse.Namespace:
     return opt
 
 
-def _clashing_meetings(alist: List[Meeting]) -> List[Tuple[Meeting, Meeting, int, str, str]]:
+def _find_clashes(starts: Sequence[int], ends: Sequence[int]) -> Iterator[Tuple[int, int]]:
     """
-    Find out the clashing Meetings.
+    Find out the clashing intervals.
+
+    Requires starts to be sorted: the scan for interval i stops at the first j
+    starting after i ends, since no later interval can clash with i either.
+    That makes it O(n + k) for k clashes.
 
     Args:
-        alist (List[Meeting]): list of Meetings objects
+        starts (Sequence[int]): intervals starts, sorted
+        ends (Sequence[int]): intervals ends
 
-    Returns:
-        List[Tuple[Meeting, Meeting, int, str, str]]:
+    Yields:
+        Tuple[int, int]: sorted index pairs (i, j), i < j, of the clashing intervals
+    """
+    n = len(starts)
+    for i in range(n):
+        end_i = ends[i]
+        for j in range(i + 1, n):
+            start_j = starts[j]
+            if start_j >= end_i:
+                break
+            if ends[j] > start_j:
+                yield (i, j)
+
+
+def _clashing_meetings(
+    alist: List[Meeting], _min=min, _hh_mm=_hh_mm
+) -> Iterator[Tuple[Meeting, Meeting, int, str, str]]:
+    """
+    Find out the clashing Meetings, lazily: result tuples are built as they are consumed.
+
+    _min and _hh_mm are bound as default arguments to skip the global lookups in the loop.
+
+    Args:
+        alist (List[Meeting]): list of Meetings objects, sorted by starting time
+
+    Yields:
+        Tuple[Meeting, Meeting, int, str, str]:
             clashing meetings and overlapping time (with start and end) in minutes
     """
-    overlaps: List[Tuple[Meeting, Meeting, int, str, str]] = []
-    for i in range(len(alist) - 1):
-        a_i = alist[i]
-        for j in range(i + 1, len(alist)):
-            a_j = alist[j]
-            l_start = max(a_i.start, a_j.start)
-            e_end = min(a_i.end, a_j.end)
-            if e_end > l_start:
-                clash_minutes = (e_end - l_start).seconds // 60
-                begin = l_start.strftime("%H:%M")
-                end = e_end.strftime("%H:%M")
-                overlaps.append(
-                    (
-                        a_i,
-                        a_j,
-                        clash_minutes,
-                        begin,
-                        end,
-                    )
-                )
-    return overlaps
+    mset = MeetingSet(alist)
+    meetings, starts, ends = mset.meetings, mset.starts, mset.ends
+    # the plain scan on purpose, not utils_numba: per clash, the loop below dominates and
+    # a numba kernel only adds its import/load time (measured slower at every size)
+    pairs = _find_clashes(starts, ends)
+    for i, j in pairs:
+        l_start = starts[j]  # sorted by start
+        e_end = _min(ends[i], ends[j])
+        yield (meetings[i], meetings[j], e_end - l_start, _hh_mm(l_start), _hh_mm(e_end))
 
 
 def get_meetings_list(data: List[str], day: Optional[str] = None) -> Tuple[List[Meeting], List[Meeting]]:
@@ -204,9 +294,8 @@ def get_meetings_list(data: List[str], day: Optional[str] = None) -> Tuple[List[
     # 12am = 00:00, 12pm = 12:00
     day_start = "0:00"
     day_end = "24:00"
-    for n, row in enumerate(data[1:]):  # skip header
-        start, end = row.strip().split(",")
-
+    for n, row in enumerate(csv.reader(data[1:])):  # skip header
+        start, end = (x.strip() for x in row)
         # parse single input, optional, defines the day work schedule, otherwise
         # otherwise any meeting in 24 h is valid
         if not end:
@@ -219,12 +308,17 @@ def get_meetings_list(data: List[str], day: Optional[str] = None) -> Tuple[List[
             meetings_list.append(meeting)
 
     # sort meeting_list by starting time, shorter first if same starting time
-    meetings_list.sort(key=cmp_to_key(Meeting.comparator))
+    meetings_list.sort()
+
+    # working hours are the same for every meeting, parse them once
+    str_day = day or str_today
+    dt_day_start = get_time_obj(f"{str_day}.{day_start}")
+    dt_day_end = get_time_obj(f"{str_day}.{day_end}")
 
     valid_meetings = []
     invalid_meetings = []
     for m in meetings_list:
-        if m.check_validity(day_start, day_end):
+        if m.check_validity(dt_day_start, dt_day_end):
             valid_meetings.append(m)
         else:
             invalid_meetings.append(m)
@@ -241,16 +335,16 @@ def process_args() -> Tuple[List[str], str]:
     """
     opt = parse_cmdline()
     with open(opt.infile) as f:
-        data_times = f.readlines()
+        data_times = f.read().splitlines()
     return data_times, opt.day
 
 
-def get_results() -> Tuple[List[Tuple[Meeting, Meeting, int, str, str]], List[Meeting]]:
+def get_results() -> Tuple[Iterator[Tuple[Meeting, Meeting, int, str, str]], List[Meeting]]:
     """
     Get all the results.
 
     Returns:
-        Tuple[List[Tuple[Meeting, Meeting, int, str, str]], List[Meeting]]:
+        Tuple[Iterator[Tuple[Meeting, Meeting, int, str, str]], List[Meeting]]:
             Clashing meetings and overlapping time (with start and end) in minutes plus invalid meetings
     """
     data_times, day = process_args()
@@ -263,21 +357,28 @@ def main() -> None:
     """
     Prints out the overlapping meetings.
     """
-    valid_tuple, invalid_list = get_results()
-    if valid_tuple:
-        day = valid_tuple[0][0].start.strftime(fmt_day)
-        print(f">>>Meetings conflict for {day}")
-    for clash in valid_tuple:
-        m1, m2, t_min, begin, end = clash
-        print(f"Meetings: <{m1}> and <{m2}> overlaps for {t_min} min ({begin} to {end})")
+    clashes, invalid_list = get_results()
+    # the report is written in joined batches: few writes, bounded memory
+    lines: List[str] = []
+    has_clashes = False
+    for m1, m2, t_min, begin, end in clashes:
+        if not has_clashes:
+            has_clashes = True
+            lines.append(f">>>Meetings conflict for {m1.start.strftime(fmt_day)}")
+        lines.append(f"Meetings: <{m1}> and <{m2}> overlaps for {t_min} min ({begin} to {end})")
+        if len(lines) >= report_batch_lines:
+            sys.stdout.write("\n".join(lines) + "\n")
+            lines.clear()
     if invalid_list:
-        if valid_tuple:
-            print()
+        if has_clashes:
+            lines.append("")
+        day = invalid_list[0].start.strftime(fmt_day)
         day_start = invalid_list[0].day_start.strftime("%H:%M")
         day_end = invalid_list[0].day_end.strftime("%H:%M")
-        print(f">>>Invalid Meetings, outside working hours for {day}: {day_start} to {day_end}")
-    for inv in invalid_list:
-        print(inv)
+        lines.append(f">>>Invalid Meetings, outside working hours for {day}: {day_start} to {day_end}")
+    lines.extend(map(repr, invalid_list))
+    if lines:
+        sys.stdout.write("\n".join(lines) + "\n")
 
 
 if __name__ == "__main__":
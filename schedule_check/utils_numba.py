@@ -0,0 +1,61 @@
+"""
+Numba compiled kernels, optional: numba (and numpy) are not required to run schedule_check.
+
+Not used by the report_schedule CLI: for a one-day schedule the per clash formatting
+dominates, so the kernel's import and load time make it slower than the plain scan.
+"""
+import numpy as np
+from numba import njit, prange
+
+
+@njit(cache=True, parallel=True)
+def find_clashes_nb(starts: np.ndarray, ends: np.ndarray) -> np.ndarray:  # pragma: no cover - compiled
+    """
+    Find out the clashing intervals, compiled version of _find_clashes.
+
+    Each i is independent, so a first parallel pass counts the clashes per i
+    and a second one fills the preallocated pairs array.
+
+    Args:
+        starts (np.ndarray): int64 intervals starts, sorted
+        ends (np.ndarray): int64 intervals ends
+
+    Returns:
+        np.ndarray: (n_clashes, 2) sorted index pairs (i, j), i < j, of the clashing intervals
+    """
+    n = starts.shape[0]
+    counts = np.zeros(n + 1, dtype=np.int64)
+    for i in prange(n):
+        c = 0
+        for j in range(i + 1, n):
+            if starts[j] >= ends[i]:
+                break
+            if ends[j] > starts[j]:
+                c += 1
+        counts[i + 1] = c
+    offsets = np.cumsum(counts)
+    pairs = np.empty((offsets[n], 2), dtype=np.int64)
+    for i in prange(n):
+        k = offsets[i]
+        for j in range(i + 1, n):
+            if starts[j] >= ends[i]:
+                break
+            if ends[j] > starts[j]:
+                pairs[k, 0] = i
+                pairs[k, 1] = j
+                k += 1
+    return pairs
+
+
+def find_clashes(starts, ends) -> np.ndarray:
+    """
+    Run find_clashes_nb on int64 buffers, e.g. MeetingSet array("q"), without copying them.
+
+    Args:
+        starts: int64 buffer of intervals starts, sorted
+        ends: int64 buffer of intervals ends
+
+    Returns:
+        np.ndarray: (n_clashes, 2) sorted index pairs (i, j), i < j, of the clashing intervals
+    """
+    return find_clashes_nb(np.frombuffer(starts, dtype=np.int64), np.frombuffer(ends, dtype=np.int64))
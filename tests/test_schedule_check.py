@@ -1,10 +1,17 @@
-from functools import cmp_to_key
+from datetime import datetime
 from subprocess import STDOUT, check_output
 
 import pytest
 
 from schedule_check import __version__
-from schedule_check.report_meetings_clashes import Meeting, _clashing_meetings, get_meetings_list, get_time_obj
+from schedule_check.report_meetings_clashes import (
+    Meeting,
+    MeetingSet,
+    _clashing_meetings,
+    _find_clashes,
+    get_meetings_list,
+    get_time_obj,
+)
 
 
 def test_version():
@@ -28,6 +35,42 @@ def test_hour_format(atime):
     assert d
 
 
+@pytest.mark.parametrize(
+    ("atime", "expected"),
+    [
+        ("2022-01-26.12:15am", datetime(2022, 1, 26, 0, 15)),
+        ("2022-01-26.12:15 PM", datetime(2022, 1, 26, 12, 15)),
+        ("2022-01-26.1:05pm", datetime(2022, 1, 26, 13, 5)),
+        ("2022-01-26.11:59pm", datetime(2022, 1, 26, 23, 59)),
+        ("2022-01-26.9:5am", datetime(2022, 1, 26, 9, 5)),
+        ("2022-01-26.9:5", datetime(2022, 1, 26, 9, 5)),
+        ("2022-1-6.18:30", datetime(2022, 1, 6, 18, 30)),
+        ("2022-01-26.00:00", datetime(2022, 1, 26, 0, 0)),
+        ("2022-01-26.24:00", datetime(2022, 1, 27, 0, 0)),
+        ("2021-12-31.24:00", datetime(2022, 1, 1, 0, 0)),
+    ],
+)
+def test_hour_values(atime, expected):
+    assert get_time_obj(atime) == expected
+
+
+@pytest.mark.parametrize(
+    ("atime"),
+    [
+        ("2022-01-26.0:30am"),
+        ("2022-01-26.13:00pm"),
+        ("2022-01-26.24:30"),
+        ("2022-01-26.24:0"),
+        ("2022-01-26.25:00"),
+        ("2022-01-26.9:60"),
+        ("2022-02-30.9:00"),
+    ],
+)
+def test_out_of_range_time(atime):
+    with pytest.raises(ValueError):
+        get_time_obj(atime)
+
+
 @pytest.mark.parametrize(
     ("atime"),
     [
@@ -36,6 +79,7 @@ def test_hour_format(atime):
         ("2022-01-26.9:30 A"),
         ("2022-01-26.9:30P"),
         ("2022-01-26 18:30"),
+        ("2022-01-26.9:30amx"),
     ],
 )
 def test_wrong_time_format(atime):
@@ -50,10 +94,16 @@ def test_class_repr():
 
 
 def test_meeting_validity():
-    pass
+    day_start = get_time_obj("2021-12-25.8:00am")
+    day_end = get_time_obj("2021-12-25.5:00pm")
+    assert Meeting("test1", "8:00am", "5:00pm", "2021-12-25").check_validity(day_start, day_end)
+    assert not Meeting("test2", "7:30am", "9:00am", "2021-12-25").check_validity(day_start, day_end)
+    m = Meeting("test3", "4:30pm", "5:30pm", "2021-12-25")
+    assert not m.check_validity(day_start, day_end)
+    assert m.day_end == day_end
 
 
-def test_comparator():
+def test_ordering():
     m1 = Meeting("test1", "7:00", "8:00am")
     m2 = Meeting("test2", "7:00", "7:30")
     m3 = Meeting("test3", "7:30", "8:30am")
@@ -62,8 +112,9 @@ def test_comparator():
     m6 = Meeting("test3", "7:30", "8:30am")  # m6 = m3
     m7 = Meeting("test7", "7:00", "8:00am")  # m7 = m1
     mm = [m3, m1, m2, m4, m5, m6, m7]
-    ms = sorted(mm, key=cmp_to_key(Meeting.comparator))
+    ms = sorted(mm)
     assert ms == [m5, m2, m1, m7, m3, m6, m4]
+    assert m3 == m6 and m1 != m7 and m2 < m1 <= m7
 
 
 @pytest.mark.parametrize(
@@ -86,11 +137,31 @@ def test_comparator():
 def test_clashes_invalids(data, msg_l, msg_c, msg_i):
     m_list, m_inv = get_meetings_list(data)
     assert repr(m_list) == msg_l
-    c = _clashing_meetings(m_list)
+    c = list(_clashing_meetings(m_list))
     assert repr(c) == msg_c
     assert repr(m_inv) == msg_i
 
 
+def test_find_clashes_numba():
+    np = pytest.importorskip("numpy")
+    utils_numba = pytest.importorskip("schedule_check.utils_numba")
+    with open("tests/times") as f:
+        m_list, _ = get_meetings_list(f.readlines(), "2021-12-25")
+    mset = MeetingSet(m_list)
+    starts = np.frombuffer(mset.starts, dtype=np.int64)
+    ends = np.frombuffer(mset.ends, dtype=np.int64)
+    pairs = utils_numba.find_clashes_nb(starts, ends).tolist()
+    assert [tuple(p) for p in pairs] == list(_find_clashes(mset.starts, mset.ends))
+    assert utils_numba.find_clashes_nb(starts[:0], ends[:0]).shape == (0, 2)
+
+
+def test_rows_with_whitespace():
+    data = ["start,end\n", "9:00,10:00 \n", " 9:30am , 10:30am \r\n", "8:00am ,\n"]
+    m_list, m_inv = get_meetings_list(data, "2021-12-25")
+    assert repr(m_list) == "[Meeting 1 @ 09:00_10:00, Meeting 2 @ 09:30_10:30]"
+    assert m_inv == []
+
+
 def test_cli():
     msgs = [
         "Meetings conflict for 2021-12-25",
@@ -103,3 +174,33 @@ def test_cli():
     out = check_output(cmd, shell=True, stderr=STDOUT).decode()
     for msg in msgs:
         assert msg in out
+
+
+def test_cli_only_invalid(tmp_path):
+    times = tmp_path / "times"
+    times.write_text("start,end\n7:00am,7:30am\n6:00pm,7:00pm\n8:00am,\n,5:00pm\n")
+    cmd = f"env python3 ./schedule_check/report_meetings_clashes.py -i {times} -d '2021-12-25'"
+    out = check_output(cmd, shell=True, stderr=STDOUT).decode()
+    assert out == (
+        ">>>Invalid Meetings, outside working hours for 2021-12-25: 08:00 to 17:00\n"
+        "Meeting 1 @ 07:00_07:30\n"
+        "Meeting 2 @ 18:00_19:00\n"
+    )
+
+
+@pytest.mark.parametrize(("batch_lines"), [1, 2, 65536])
+def test_main_batched_output(monkeypatch, capsys, batch_lines):
+    from schedule_check import report_meetings_clashes
+
+    monkeypatch.setattr(report_meetings_clashes, "report_batch_lines", batch_lines)
+    monkeypatch.setattr("sys.argv", ["report_schedule", "-i", "tests/times", "-d", "2021-12-25"])
+    report_meetings_clashes.main()
+    assert capsys.readouterr().out == (
+        ">>>Meetings conflict for 2021-12-25\n"
+        "Meetings: <Meeting 2 @ 09:00_10:00> and <Meeting 3 @ 09:30_10:30> overlaps for 30 min (09:30 to 10:00)\n"
+        "Meetings: <Meeting 4 @ 10:45_13:00> and <Meeting 5 @ 12:00_13:00> overlaps for 60 min (12:00 to 13:00)\n"
+        "\n"
+        ">>>Invalid Meetings, outside working hours for 2021-12-25: 08:00 to 17:00\n"
+        "Meeting 9 @ 18:00_19:00\n"
+        "Meeting 10 @ 20:00_21:00\n"
+    )